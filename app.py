@@ -3,15 +3,63 @@ Bird Finder - Streamlit Application
 Identifies birds based on user descriptions using Mistral AI and eBird API.
 """
 import streamlit as st
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
-import time
+import os
+import re
+import traceback
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
-from mistral_client import get_bird_suggestions
-from ebird_client import calculate_probabilities
-from config import DEFAULT_DAYS_BACK, DEFAULT_YEARS_BACK
+from mistral_client import get_bird_suggestions, get_description_embedding
+from ebird_client import calculate_probabilities_with_status, get_species_codes_batch, preload_taxonomy
+from semantic_cache import SemanticCache
+from disk_cache import cache_get, cache_set
+from config import (
+    DEFAULT_DAYS_BACK,
+    DEFAULT_YEARS_BACK,
+    CACHE_DIR,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_LOOKUP_TIMEOUT
+)
+
+# Field-mark words that change the identification; similarly worded descriptions only share
+# cached suggestions if they mention the same ones
+_COLOR_WORDS = frozenset([
+    "red", "orange", "yellow", "green", "blue", "purple", "pink", "brown", "black",
+    "white", "gray", "grey", "buff", "rufous", "chestnut", "olive", "tan", "crimson",
+    "scarlet", "golden", "rusty", "iridescent", "striped", "spotted", "streaked", "barred"
+])
+
+
+@dataclass
+class Scores:
+    """
+    Combined ranking scores stored as parallel arrays (one entry per bird).
+    
+    Scores are on a 0-100 scale for display.
+    """
+    names: np.ndarray
+    combined: np.ndarray
+    llm_rank: np.ndarray
+    llm_score: np.ndarray
+    ebird_prob: np.ndarray
+    ebird_score: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def ranking(self) -> np.ndarray:
+        """
+        Get positions ordered by combined score (descending).
+        
+        A stable sort on the negated scores keeps the LLM order for ties.
+        """
+        return np.argsort(-self.combined, kind="stable")
 
 
 def calculate_combined_scores(
@@ -20,7 +68,7 @@ def calculate_combined_scores(
     llm_ranks: Dict[str, int],
     llm_weight: float,
     ebird_weight: float
-) -> Dict[str, Dict]:
+) -> Scores:
     """
     Calculate combined weighted scores from LLM ranking and eBird probabilities.
     
@@ -32,41 +80,38 @@ def calculate_combined_scores(
         ebird_weight: Weight for eBird probability (0-1)
     
     Returns:
-        Dictionary mapping bird names to score data including combined_score, llm_score, ebird_probability
+        Scores with combined_score, llm_score, and ebird_probability per bird, in suggestion order
     """
-    combined_scores = {}
+    names = [b["common_name"] for b in bird_suggestions if b.get("common_name")]
+    count = len(names)
     
-    for bird_dict in bird_suggestions:
-        common_name = bird_dict.get("common_name", "")
-        if not common_name:
-            continue
-        
-        # Get LLM rank (1-5, where 1 is best)
-        llm_rank = llm_ranks.get(common_name, 5)  # Default to worst rank if not found
-        
-        # Convert LLM rank to score (rank 1 = 1.0, rank 5 = 0.2)
-        # Formula: (6 - rank) / 5
-        llm_score = (6 - llm_rank) / 5.0
-        
-        # Get eBird probability (already 0-100, normalize to 0-1)
-        ebird_prob = ebird_probabilities.get(common_name, 0.0)
-        ebird_score = ebird_prob / 100.0
-        
-        # Calculate combined score
-        combined_score = (llm_score * llm_weight) + (ebird_score * ebird_weight)
-        
-        # Normalize to 0-100 for display
-        combined_score_percent = combined_score * 100.0
-        
-        combined_scores[common_name] = {
-            "combined_score": combined_score_percent,
-            "llm_rank": llm_rank,
-            "llm_score": llm_score * 100.0,  # For display
-            "ebird_probability": ebird_prob,
-            "ebird_score": ebird_score * 100.0  # For display
-        }
-    
-    return combined_scores
+    # Get LLM ranks (1-5, where 1 is best), defaulting to worst rank if not found
+    llm_ranks_arr = np.fromiter((llm_ranks.get(n, 5) for n in names), dtype=np.int32, count=count)
+    
+    # Get eBird probabilities (already 0-100)
+    ebird_probs_arr = np.fromiter((ebird_probabilities.get(n, 0.0) for n in names), dtype=np.float32, count=count)
+    
+    # Convert LLM rank to score (rank 1 = 1.0, rank 5 = 0.2)
+    # Formula: (6 - rank) / 5
+    llm_score_arr = (6.0 - llm_ranks_arr.astype(np.float32)) * (1 / 5.0)
+    
+    # Normalize eBird probability to 0-1
+    ebird_score_arr = ebird_probs_arr / 100.0
+    
+    # Calculate combined score as a single weighted sum over the (N, 2) score matrix,
+    # normalized to 0-100 for display
+    scores = np.stack([llm_score_arr, ebird_score_arr], axis=1)
+    weights = np.array([llm_weight, ebird_weight], dtype=np.float32)
+    combined_arr = np.einsum('ij,j->i', scores, weights) * 100.0
+    
+    return Scores(
+        names=np.array(names, dtype=object),
+        combined=combined_arr,
+        llm_rank=llm_ranks_arr,
+        llm_score=llm_score_arr * 100.0,  # For display
+        ebird_prob=ebird_probs_arr,
+        ebird_score=ebird_score_arr * 100.0  # For display
+    )
 
 # Try to import geolocation component
 try:
@@ -83,13 +128,25 @@ st.set_page_config(
 )
 
 # Initialize geocoder
+@st.cache_resource
+def _get_geolocator() -> Nominatim:
+    """Get the Nominatim client shared across reruns (reuses its HTTP connections)."""
+    return Nominatim(user_agent="bird_finder_app")
+
+
 @st.cache_data
 def geocode_location(location_string: str):
-    """Geocode a location string to coordinates."""
+    """Geocode a location string to coordinates (persisted on disk across restarts)."""
+    cache_key = location_string.strip().lower()
+    cached = cache_get("geocode", cache_key)
+    if cached:
+        return tuple(cached)
+    
     try:
-        geolocator = Nominatim(user_agent="bird_finder_app")
+        geolocator = _get_geolocator()
         location = geolocator.geocode(location_string, timeout=10)
         if location:
+            cache_set("geocode", cache_key, [location.latitude, location.longitude])
             return location.latitude, location.longitude
         return None, None
     except (GeocoderTimedOut, GeocoderServiceError, Exception) as e:
@@ -97,6 +154,204 @@ def geocode_location(location_string: str):
         return None, None
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def _month_year_context() -> str:
+    """
+    Get the date context sent to Mistral (e.g., "December 2024").
+    
+    Pinned to month resolution so the prompt stays identical across requests in the same month.
+    """
+    return datetime.now().strftime("%B %Y")
+
+
+@st.cache_resource
+def _get_background_executor() -> ThreadPoolExecutor:
+    """Get the thread pool used to overlap independent API calls."""
+    return ThreadPoolExecutor(max_workers=4)
+
+
+@st.cache_resource
+def _get_semantic_cache() -> SemanticCache:
+    """Get the semantic cache shared by all sessions."""
+    return SemanticCache(
+        os.path.join(CACHE_DIR, "semantic_cache.npz"),
+        SEMANTIC_CACHE_THRESHOLD
+    )
+
+
+def _field_marks(description: str) -> str:
+    """Get the sorted color/pattern words of a description (e.g., "black,red")."""
+    return ",".join(sorted(_COLOR_WORDS.intersection(re.findall(r"[a-z]+", description.lower()))))
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_bird_suggestions(description: str, location_context: str, date_context: str) -> Dict:
+    """Get Mistral bird suggestions, reusing results for identical or similarly worded inputs."""
+    semantic_cache = _get_semantic_cache()
+    context = f"{location_context}|{date_context}|{_field_marks(description)}"
+    
+    # Embed in the background and only wait briefly for it: the semantic cache is an
+    # optimization and must not hold up the Mistral call on a miss
+    embedding_future = _get_background_executor().submit(get_description_embedding, description)
+    try:
+        embedding = embedding_future.result(timeout=SEMANTIC_CACHE_LOOKUP_TIMEOUT)
+    except FutureTimeoutError:
+        embedding = None
+    except Exception as e:
+        print(f"Skipping semantic cache: {str(e)}")
+        embedding = None
+    
+    if embedding is not None:
+        cached_result = semantic_cache.lookup(embedding, context)
+        if cached_result:
+            return cached_result
+    
+    mistral_result = get_bird_suggestions(
+        description,
+        location_info=location_context,
+        date_info=date_context
+    )
+    
+    # A slow embedding has usually finished by now; store the result under it if so
+    if embedding is None and embedding_future.done() and embedding_future.exception() is None:
+        embedding = embedding_future.result()
+    
+    if embedding is not None and mistral_result.get("suggestions"):
+        semantic_cache.add(embedding, context, mistral_result)
+    
+    return mistral_result
+
+
+def _fetch_results(
+    description: str,
+    location: Dict,
+    days_back: int,
+    years_back: int,
+    ebird_weight: float,
+    progress_bar,
+    status_text
+) -> Optional[Dict]:
+    """
+    Get bird suggestions from Mistral and observation probabilities from eBird.
+    
+    Errors are reported in the app, so callers only need to stop on None.
+    
+    Returns:
+        Dictionary with 'bird_suggestions', 'probabilities', 'model_used', 'ebird_skipped' and
+        'ebird_complete' (False if some eBird lookups failed), or None if either API step failed
+    """
+    # Initialize variables for results display
+    model_used = "unknown"
+    bird_suggestions = []
+    
+    # Load the eBird taxonomy in the background while Mistral works; Step 2 needs it
+    # for species lookups but it does not depend on the suggestions
+    taxonomy_future = _get_background_executor().submit(preload_taxonomy)
+    
+    # Step 1: Get bird suggestions from Mistral
+    status_text.text("Asking AI to identify possible bird species...")
+    progress_bar.progress(20)
+    
+    try:
+        # Build location and date context for the LLM
+        location_context = ""
+        if location["type"] == "coords":
+            # ~1km precision is plenty for bird ranges and lets nearby requests share
+            # cached suggestions; eBird queries still use the full-precision location
+            location_context = f"Latitude {location['latitude']:.2f}, Longitude {location['longitude']:.2f}"
+        elif location["type"] == "region":
+            location_context = location.get("region_code", "")
+        
+        date_context = _month_year_context()
+        
+        # location_context and date_context are passed as separate arguments and end up
+        # in the user message only; never fold them into mistral_client.SYSTEM_PROMPT,
+        # which must stay identical across requests for provider-side prompt caching
+        mistral_result = _cached_bird_suggestions(
+            description.strip(),
+            location_context,
+            date_context
+        )
+        progress_bar.progress(40)
+        
+        # Extract suggestions and model name
+        bird_suggestions = mistral_result.get("suggestions", [])
+        model_used = mistral_result.get("model_used", "unknown")
+        
+        if not bird_suggestions or all(not b.get("common_name") for b in bird_suggestions):
+            st.error("Could not generate bird suggestions. Please try a more detailed description.")
+            return None
+        
+        # Filter out empty suggestions
+        bird_suggestions = [b for b in bird_suggestions if b and b.get("common_name")]
+        
+        if not bird_suggestions:
+            st.error("No valid bird suggestions generated. Please try a more detailed description.")
+            return None
+        
+    except ValueError as e:
+        st.error(str(e))
+        return None
+    except Exception as e:
+        error_msg = str(e)
+        if "API key" in error_msg.lower():
+            st.error(f"API Configuration Error: {error_msg}")
+            st.info("Please check your Mistral API key in `.env` file (local) or Streamlit Cloud secrets.")
+        else:
+            st.error(f"Error getting bird suggestions: {error_msg}")
+            st.info("Please try again with a more detailed description.")
+        return None
+    
+    # Step 2: Get observation data from eBird. With a zero eBird weight the
+    # probabilities would only be multiplied by 0, so skip the API calls entirely
+    ebird_skipped = ebird_weight <= 1e-6
+    ebird_complete = True
+    if ebird_skipped:
+        probabilities = {b["common_name"]: 0.0 for b in bird_suggestions}
+    else:
+        status_text.text("📊 Analyzing eBird observation data...")
+        progress_bar.progress(60)
+        
+        try:
+            # Wait for the background taxonomy load so it is not fetched twice
+            taxonomy_future.result()
+            
+            # Pass full structured data to calculate_probabilities_with_status
+            probabilities, ebird_complete = calculate_probabilities_with_status(
+                bird_suggestions,
+                location,
+                days_back=days_back,
+                years_back=years_back
+            )
+            progress_bar.progress(80)
+            
+        except ValueError as e:
+            st.error(f"Invalid input: {str(e)}")
+            return None
+        except Exception as e:
+            error_msg = str(e)
+            if "API key" in error_msg.lower():
+                st.error(f"API Configuration Error: {error_msg}")
+                st.info("Please check your eBird API key in `.env` file (local) or Streamlit Cloud secrets.")
+            elif "taxonomy" in error_msg.lower():
+                st.error(f"Error loading bird taxonomy: {error_msg}")
+                st.info("This might be a temporary eBird API issue. Please try again in a moment.")
+                with st.expander("Technical Details"):
+                    st.code(str(e))
+            else:
+                st.error(f"Error calculating probabilities: {error_msg}")
+                st.info("Please try again or adjust your location settings.")
+            return None
+    
+    return {
+        "bird_suggestions": bird_suggestions,
+        "probabilities": probabilities,
+        "model_used": model_used,
+        "ebird_skipped": ebird_skipped,
+        "ebird_complete": ebird_complete
+    }
+
+
 def main():
     st.title("Bird Finder")
     st.markdown("Describe a bird you saw, and we'll identify it using AI and eBird observation data!")
@@ -257,6 +512,17 @@ def main():
     st.markdown("---")
     submit_button = st.button("🔍 Identify Bird", type="primary", use_container_width=True)
     
+    # Mistral suggestions and eBird probabilities only depend on these inputs, not on the
+    # ranking weights, so moving the weight slider re-ranks the last results without new API calls
+    inputs_key = (
+        description.strip() if description else "",
+        tuple(sorted(location.items())) if location else None,
+        days_back,
+        years_back
+    )
+    last_results = st.session_state.get("last_results")
+    inputs_match = last_results is not None and st.session_state.get("last_inputs") == inputs_key
+    
     # Process request
     if submit_button:
         # Validation
@@ -268,135 +534,91 @@ def main():
             st.error("Please specify your location.")
             return
         
-        # Show progress
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+        # An explicit click always refetches (cheap thanks to the API caches), so eBird
+        # lookups that failed last time are retried
+        results_current = False
+    elif not inputs_match:
+        return
+    else:
+        # Results fetched with eBird skipped have no probabilities to re-rank with, so
+        # raising the eBird weight refetches them with eBird data
+        results_current = not (last_results["ebird_skipped"] and ebird_weight > 1e-6)
+    
+    # Show progress
+    progress_bar = st.empty()
+    status_text = st.empty()
+    
+    try:
+        if results_current:
+            results = last_results
+        else:
+            progress_bar.progress(0)
+            results = _fetch_results(
+                description,
+                location,
+                days_back,
+                years_back,
+                ebird_weight,
+                progress_bar,
+                status_text
+            )
+            if results is None:
+                return
+            st.session_state.last_inputs = inputs_key
+            st.session_state.last_results = results
         
-        # Initialize variables for results display
-        model_used = "unknown"
-        bird_suggestions = []
+        bird_suggestions = results["bird_suggestions"]
+        probabilities = results["probabilities"]
+        model_used = results["model_used"]
+        ebird_skipped = results["ebird_skipped"]
+        ebird_complete = results.get("ebird_complete", True)
         
-        try:
-            # Step 1: Get bird suggestions from Mistral
-            status_text.text("Asking AI to identify possible bird species...")
-            progress_bar.progress(20)
-            
-            try:
-                # Build location and date context for the LLM
-                location_context = ""
-                if location["type"] == "coords":
-                    location_context = f"Latitude {location['latitude']:.4f}, Longitude {location['longitude']:.4f}"
-                elif location["type"] == "region":
-                    location_context = location.get("region_code", "")
-                
-                date_context = datetime.now().strftime("%B %Y")
-                
-                mistral_result = get_bird_suggestions(
-                    description,
-                    location_info=location_context,
-                    date_info=date_context
-                )
-                progress_bar.progress(40)
-                
-                # Extract suggestions and model name
-                bird_suggestions = mistral_result.get("suggestions", [])
-                model_used = mistral_result.get("model_used", "unknown")
-                
-                if not bird_suggestions or all(not b.get("common_name") for b in bird_suggestions):
-                    st.error("Could not generate bird suggestions. Please try a more detailed description.")
-                    return
-                
-                # Filter out empty suggestions
-                bird_suggestions = [b for b in bird_suggestions if b and b.get("common_name")]
-                
-                if not bird_suggestions:
-                    st.error("No valid bird suggestions generated. Please try a more detailed description.")
-                    return
-                
-            except ValueError as e:
-                st.error(str(e))
-                return
-            except Exception as e:
-                error_msg = str(e)
-                if "API key" in error_msg.lower():
-                    st.error(f"API Configuration Error: {error_msg}")
-                    st.info("Please check your Mistral API key in `.env` file (local) or Streamlit Cloud secrets.")
-                else:
-                    st.error(f"Error getting bird suggestions: {error_msg}")
-                    st.info("Please try again with a more detailed description.")
-                return
-            
-            # Step 2: Get observation data from eBird
-            status_text.text("📊 Analyzing eBird observation data...")
-            progress_bar.progress(60)
-            
-            try:
-                # Pass full structured data to calculate_probabilities
-                probabilities = calculate_probabilities(
-                    bird_suggestions,
-                    location,
-                    days_back=days_back,
-                    years_back=years_back
-                )
-                progress_bar.progress(80)
-                
-            except ValueError as e:
-                st.error(f"Invalid input: {str(e)}")
-                return
-            except Exception as e:
-                error_msg = str(e)
-                if "API key" in error_msg.lower():
-                    st.error(f"API Configuration Error: {error_msg}")
-                    st.info("Please check your eBird API key in `.env` file (local) or Streamlit Cloud secrets.")
-                elif "taxonomy" in error_msg.lower():
-                    st.error(f"Error loading bird taxonomy: {error_msg}")
-                    st.info("This might be a temporary eBird API issue. Please try again in a moment.")
-                    with st.expander("Technical Details"):
-                        st.code(str(e))
-                else:
-                    st.error(f"Error calculating probabilities: {error_msg}")
-                    st.info("Please try again or adjust your location settings.")
-                return
-            
-            # Step 3: Calculate combined weighted scores
-            status_text.text("📊 Calculating combined scores...")
-            progress_bar.progress(90)
-            
-            # Create mapping of bird names to their LLM ranks (1-5, where 1 is best)
-            llm_ranks = {}
-            for idx, bird_dict in enumerate(bird_suggestions, 1):
-                common_name = bird_dict.get("common_name", "")
-                if common_name:
-                    llm_ranks[common_name] = idx
-            
-            # Calculate combined scores
-            combined_scores = calculate_combined_scores(
-                bird_suggestions,
-                probabilities,
-                llm_ranks,
-                llm_weight,
-                ebird_weight
-            )
-            
-            # Step 4: Display results
-            status_text.text("✅ Analysis complete!")
-            progress_bar.progress(100)
-            time.sleep(0.5)  # Brief pause for UX
-            progress_bar.empty()
-            status_text.empty()
-            
-            st.markdown("---")
-            st.header("Identification Results")
-            
-            # Sort by combined score (descending)
-            sorted_results = sorted(
-                combined_scores.items(),
-                key=lambda x: x[1]["combined_score"],
-                reverse=True
+        # Step 3: Calculate combined weighted scores
+        status_text.text("📊 Calculating combined scores...")
+        progress_bar.progress(90)
+        
+        # Create mapping of bird names to their LLM ranks (1-5, where 1 is best)
+        llm_ranks = {}
+        for idx, bird_dict in enumerate(bird_suggestions, 1):
+            common_name = bird_dict.get("common_name", "")
+            if common_name:
+                llm_ranks[common_name] = idx
+        
+        # Calculate combined scores
+        combined_scores = calculate_combined_scores(
+            bird_suggestions,
+            probabilities,
+            llm_ranks,
+            llm_weight,
+            ebird_weight
+        )
+        
+        # Lookups shared by both result views
+        bird_dict_map = {b["common_name"]: b for b in bird_suggestions if b.get("common_name")}
+        species_codes = get_species_codes_batch(bird_suggestions)
+        
+        # Step 4: Display results
+        status_text.text("✅ Analysis complete!")
+        progress_bar.progress(100)
+        progress_bar.empty()
+        status_text.empty()
+        
+        st.markdown("---")
+        st.header("Identification Results")
+        
+        if not ebird_complete:
+            st.warning(
+                "eBird is currently unavailable for some or all of these species, so their "
+                "observation probabilities may be missing. Click **Identify Bird** again to retry."
             )
-            
-            # Display results
-            if sum(probabilities.values()) == 0:
+        
+        # Display results
+        if ebird_skipped or not any(v > 0 for v in probabilities.values()):
+            if ebird_skipped:
+                st.info("The eBird weight is 0, so results are ranked by description match only.")
+            elif not ebird_complete:
+                st.info("Results are ranked by description match only.")
+            else:
                 st.warning(
                     "No observations found for these species in your location and time period. "
                     "Results are ranked by description match only.\n\n"
@@ -405,102 +627,91 @@ def main():
                     "- The time period selected has no observations\n"
                     "- The species names may need adjustment"
                 )
-                st.subheader("Suggested Species (by Description Match):")
-                
-                # Get species codes for eBird links
-                from ebird_client import get_species_code
-                for i, bird_dict in enumerate(bird_suggestions, 1):
-                    common_name = bird_dict.get("common_name", "")
-                    scientific_name = bird_dict.get("scientific_name", "")
-                    if common_name:
-                        species_code = get_species_code(common_name, scientific_name)
-                        if species_code:
-                            ebird_url = f"https://ebird.org/species/{species_code}"
-                            common_name_link = f"[{common_name}]({ebird_url})"
-                        else:
-                            common_name_link = common_name
-                        
-                        if scientific_name:
-                            st.write(f"{i}. **{common_name_link}** (*{scientific_name}*)")
-                        else:
-                            st.write(f"{i}. **{common_name_link}**")
-                
-                # Display model name at the bottom
-                st.markdown("---")
-                st.caption(f"🤖 Model used: **{model_used}**")
-            else:
-                # Match scores with bird suggestions (including scientific names)
-                bird_dict_map = {b["common_name"]: b for b in bird_suggestions if b.get("common_name")}
+            st.subheader("Suggested Species (by Description Match):")
+            
+            for i, (common_name, bird_dict) in enumerate(bird_dict_map.items(), 1):
+                scientific_name = bird_dict.get("scientific_name", "")
+                species_code = species_codes.get(common_name)
+                if species_code:
+                    ebird_url = f"https://ebird.org/species/{species_code}"
+                    common_name_link = f"[{common_name}]({ebird_url})"
+                else:
+                    common_name_link = common_name
                 
-                # Get species codes for eBird links
-                from ebird_client import get_species_code
-                species_codes = {}
-                for bird_name in bird_dict_map.keys():
-                    bird_dict = bird_dict_map[bird_name]
-                    code = get_species_code(
-                        bird_dict.get("common_name", ""),
-                        bird_dict.get("scientific_name", "")
-                    )
-                    if code:
-                        species_codes[bird_name] = code
+                if scientific_name:
+                    st.write(f"{i}. **{common_name_link}** (*{scientific_name}*)")
+                else:
+                    st.write(f"{i}. **{common_name_link}**")
+            
+            # Display model name at the bottom
+            st.markdown("---")
+            st.caption(f"🤖 Model used: **{model_used}**")
+        else:
+            # Build one table sorted by combined score (descending); a single dataframe is
+            # far fewer frontend messages than per-bird columns, metrics and expanders
+            rows = []
+            breakdown = []
+            for idx in combined_scores.ranking():
+                bird_name = combined_scores.names[idx]
+                if not bird_name or not bird_name.strip():
+                    continue
                 
-                # Create columns for better display
-                for i, (bird_name, score_data) in enumerate(sorted_results):
-                    if not bird_name or not bird_name.strip():
-                        continue
-                    
-                    bird_dict = bird_dict_map.get(bird_name, {})
-                    scientific_name = bird_dict.get("scientific_name", "")
-                    combined_score = score_data["combined_score"]
-                    ebird_prob = score_data["ebird_probability"]
-                    llm_rank = score_data["llm_rank"]
-                    species_code = species_codes.get(bird_name, "")
-                    
-                    col1, col2, col3 = st.columns([3, 1, 1])
-                    with col1:
-                        # Create eBird link if species code is available
-                        if species_code:
-                            ebird_url = f"https://ebird.org/species/{species_code}"
-                            bird_name_link = f"[{bird_name}]({ebird_url})"
-                        else:
-                            bird_name_link = bird_name
-                        
-                        if scientific_name:
-                            st.subheader(f"{i+1}. {bird_name_link}")
-                            st.caption(f"*{scientific_name}*")
-                        else:
-                            st.subheader(f"{i+1}. {bird_name_link}")
-                    with col2:
-                        st.metric("Combined Score", f"{combined_score:.1f}")
-                    with col3:
-                        with st.expander("Details"):
-                            st.write(f"**LLM Rank:** {llm_rank} (score: {score_data['llm_score']:.1f})")
-                            st.write(f"**eBird Prob:** {ebird_prob:.1f}")
-                            st.write(f"**Weights Used:** LLM={llm_weight:.2f} ({llm_weight*100:.0f}%), eBird={ebird_weight:.2f} ({ebird_weight*100:.0f}%)")
-                            st.write(f"**Calculation:** ({score_data['llm_score']:.1f} × {llm_weight:.2f}) + ({ebird_prob:.1f} × {ebird_weight:.2f}) = {combined_score:.1f}")
-                            if species_code:
-                                st.write(f"**eBird Page:** [View on eBird](https://ebird.org/species/{species_code})")
-                    
-                    # Progress bar for visual representation
-                    st.progress(combined_score / 100.0)
-                    st.markdown("---")
+                bird_dict = bird_dict_map.get(bird_name, {})
+                combined_score = float(combined_scores.combined[idx])
+                llm_score = float(combined_scores.llm_score[idx])
+                ebird_prob = float(combined_scores.ebird_prob[idx])
+                llm_rank = int(combined_scores.llm_rank[idx])
+                species_code = species_codes.get(bird_name, "")
                 
-                # Display model name at the bottom
-                st.markdown("---")
-                st.caption(f"🤖 Model used: **{model_used}**")
-        
-        except Exception as e:
-            st.error(f"An unexpected error occurred: {str(e)}")
-            st.info("Please try again. If the problem persists, check your API keys and network connection.")
-            import traceback
-            with st.expander("Error Details"):
-                st.code(traceback.format_exc())
-        
-        finally:
-            progress_bar.empty()
-            status_text.empty()
+                rows.append({
+                    "Rank": len(rows) + 1,
+                    "Bird": bird_name,
+                    "Scientific": bird_dict.get("scientific_name", ""),
+                    "Combined": combined_score,
+                    "LLM Rank": llm_rank,
+                    "eBird Prob": ebird_prob,
+                    "eBird Link": f"https://ebird.org/species/{species_code}" if species_code else None
+                })
+                breakdown.append(
+                    f"- **{bird_name}:** ({llm_score:.1f} × {llm_weight:.2f}) + "
+                    f"({ebird_prob:.1f} × {ebird_weight:.2f}) = {combined_score:.1f}"
+                )
+            
+            st.dataframe(
+                pd.DataFrame(rows),
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "Combined": st.column_config.ProgressColumn(
+                        "Combined Score", format="%.1f", min_value=0, max_value=100
+                    ),
+                    "eBird Prob": st.column_config.NumberColumn(format="%.1f"),
+                    "eBird Link": st.column_config.LinkColumn(display_text="View on eBird")
+                }
+            )
+            
+            with st.expander("Show calculation breakdown"):
+                st.markdown(
+                    f"**Weights Used:** LLM={llm_weight:.2f} ({llm_weight*100:.0f}%), "
+                    f"eBird={ebird_weight:.2f} ({ebird_weight*100:.0f}%)\n\n"
+                    "**Calculation:** (LLM score × LLM weight) + (eBird prob × eBird weight)\n\n"
+                    + "\n".join(breakdown)
+                )
+            
+            # Display model name at the bottom
+            st.markdown("---")
+            st.caption(f"🤖 Model used: **{model_used}**")
+    
+    except Exception as e:
+        st.error(f"An unexpected error occurred: {str(e)}")
+        st.info("Please try again. If the problem persists, check your API keys and network connection.")
+        with st.expander("Error Details"):
+            st.code(traceback.format_exc())
+    
+    finally:
+        progress_bar.empty()
+        status_text.empty()
 
 
 if __name__ == "__main__":
     main()
-
@@ -3,16 +3,25 @@ Configuration module for Bird Finder app.
 Handles loading API keys from Streamlit secrets (for Cloud) or .env file (for local).
 """
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
+try:
+    import streamlit as st
+except ImportError:
+    st = None
+
 # Load environment variables from .env file (for local development)
 load_dotenv()
 
 
+@lru_cache(maxsize=None)
 def get_api_key(key_name: str) -> str:
     """
     Get API key from Streamlit secrets (Cloud) or environment variable (local).
     
+    Keys are memoized for the life of the process; a missing key is not cached.
+    
     Args:
         key_name: Name of the API key (e.g., 'MISTRAL_API_KEY', 'EBIRD_API_KEY')
     
@@ -24,10 +33,9 @@ def get_api_key(key_name: str) -> str:
     """
     # Try Streamlit secrets first (for Cloud deployment)
     try:
-        import streamlit as st
-        if hasattr(st, 'secrets') and key_name in st.secrets:
+        if st is not None and hasattr(st, 'secrets') and key_name in st.secrets:
             return st.secrets[key_name]
-    except (ImportError, RuntimeError, AttributeError):
+    except (RuntimeError, AttributeError):
         # Streamlit not available or not in Streamlit context
         pass
     
@@ -62,3 +70,14 @@ EBIRD_API_BASE_URL = "https://api.ebird.org/v2"
 DEFAULT_DAYS_BACK = 30
 DEFAULT_YEARS_BACK = 5
 
+
+# Local cache settings
+CACHE_DIR = os.getenv("BIRD_FINDER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "bird-finder"))
+
+# Minimum cosine similarity for reusing suggestions from a previous, similarly worded description.
+# mistral-embed scores descriptions differing in one field mark (e.g., "red" vs "yellow breast")
+# very close together, so this is strict and the app also requires the same colors to be mentioned
+SEMANTIC_CACHE_THRESHOLD = 0.97
+
+# Seconds to wait for the description embedding before asking Mistral for suggestions anyway
+SEMANTIC_CACHE_LOOKUP_TIMEOUT = 2.0
@@ -0,0 +1,85 @@
+"""
+Persistent key-value cache for Bird Finder.
+Stores JSON-serializable values in a SQLite database so they survive app restarts.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+from config import CACHE_DIR
+
+CACHE_PATH = os.path.join(CACHE_DIR, "cache.sqlite3")
+
+_connection = None
+_lock = threading.Lock()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """Open the cache database (once per process)."""
+    global _connection
+
+    if _connection is None:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        connection = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "created REAL NOT NULL, PRIMARY KEY (namespace, key))"
+        )
+        connection.commit()
+        _connection = connection
+    return _connection
+
+
+def cache_get(namespace: str, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+    """
+    Read a value from the disk cache.
+
+    Args:
+        namespace: Cache namespace (e.g., "geocode")
+        key: Key within the namespace
+        max_age: Maximum age in seconds, or None to never expire
+
+    Returns:
+        Cached value, or None if missing, expired, or the cache is unavailable
+    """
+    try:
+        with _lock:
+            row = _get_connection().execute(
+                "SELECT value, created FROM cache WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+    except (sqlite3.Error, OSError) as e:
+        print(f"Disk cache read error: {str(e)}")
+        return None
+
+    if row is None:
+        return None
+
+    value, created = row
+    if max_age is not None and time.time() - created > max_age:
+        return None
+    return json.loads(value)
+
+
+def cache_set(namespace: str, key: str, value: Any):
+    """
+    Write a value to the disk cache, replacing any existing entry.
+
+    Args:
+        namespace: Cache namespace (e.g., "geocode")
+        key: Key within the namespace
+        value: JSON-serializable value
+    """
+    try:
+        with _lock:
+            connection = _get_connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, created) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), time.time())
+            )
+            connection.commit()
+    except (sqlite3.Error, OSError) as e:
+        print(f"Disk cache write error: {str(e)}")
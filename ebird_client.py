@@ -2,10 +2,31 @@
 eBird API client for bird observation data.
 Handles species code lookup, observation queries, and probability calculations.
 """
+import csv
+import numpy as np
+import os
+import pickle
 import requests
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
-from config import get_ebird_api_key
+from bisect import bisect_left
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple
+from datetime import date, datetime, timedelta
+from config import get_ebird_api_key, CACHE_DIR
+
+# Prefer orjson for decoding large observation/taxonomy payloads
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
 
 # Try to import streamlit for caching (only works in Streamlit context)
 try:
@@ -22,72 +43,141 @@ except (ImportError, RuntimeError):
 
 EBIRD_API_BASE_URL = "https://api.ebird.org/v2"
 
+# Maximum concurrent per-species observation requests
+MAX_FETCH_WORKERS = 8
+
+
+# In-process TTL cache of observation counts per query. Probabilities only need the
+# counts, and a count stays small where a filtered list can hold 10,000 observations
+OBSERVATION_CACHE_TTL = 3600  # seconds
+OBSERVATION_CACHE_MAXSIZE = 1024
+_observation_cache = {}  # key -> (timestamp, observation count)
+_observation_cache_lock = threading.Lock()
+
+
+def _get_cached_count(key: tuple) -> Optional[int]:
+    """Get a cached observation count, or None if missing or expired."""
+    with _observation_cache_lock:
+        entry = _observation_cache.get(key)
+        if entry is None:
+            return None
+        timestamp, count = entry
+        if time.monotonic() - timestamp > OBSERVATION_CACHE_TTL:
+            del _observation_cache[key]
+            return None
+        return count
+
+
+def _cache_count(key: tuple, count: int):
+    """Cache an observation count, evicting the oldest entry when full."""
+    with _observation_cache_lock:
+        if key not in _observation_cache and len(_observation_cache) >= OBSERVATION_CACHE_MAXSIZE:
+            # Dicts keep insertion order, so the first key is the oldest
+            del _observation_cache[next(iter(_observation_cache))]
+        _observation_cache[key] = (time.monotonic(), count)
 
-# Cache taxonomy data
-_taxonomy_cache = None
 
-def _load_taxonomy() -> Optional[List[Dict]]:
-    """Load eBird taxonomy (cached)."""
-    global _taxonomy_cache
+# Shared HTTP session (pooled connections to api.ebird.org)
+_session = None
+
+def get_session() -> requests.Session:
+    """
+    Get the shared eBird HTTP session, creating it on first use.
     
-    if _taxonomy_cache is not None:
-        return _taxonomy_cache
+    The session reuses connections, retries transient errors, and sends the API token
+    header on every request. Tests can replace it by assigning ebird_client._session.
     
+    Raises:
+        ValueError: If the eBird API key is not configured
+    """
+    global _session
+    
+    if _session is None:
+        retry = Retry(
+            total=3,
+            read=False,  # Never retry read timeouts: each attempt could wait out the full timeout
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False  # Let raise_for_status() report the final response
+        )
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+        session.headers["X-eBirdApiToken"] = get_ebird_api_key()
+        _session = session
+    return _session
+
+
+# On-disk copy of the taxonomy index; the eBird taxonomy only changes about once a year
+TAXONOMY_CACHE_PATH = os.path.join(CACHE_DIR, "taxonomy.pkl")
+TAXONOMY_MAX_AGE = 30 * 24 * 3600  # seconds before revalidating with eBird
+# Bump whenever _TaxonomyIndex changes so older pickles are rebuilt instead of reused
+TAXONOMY_CACHE_VERSION = 1
+
+
+def _load_taxonomy(
+    validators: Optional[Dict[str, str]] = None
+) -> Tuple[Optional[List[Tuple[str, str, str]]], Optional[Dict[str, str]]]:
+    """
+    Download the eBird taxonomy.
+    
+    Args:
+        validators: ETag/Last-Modified of a previous download; if given, the request is
+            conditional and an unchanged taxonomy is not downloaded again
+    
+    Returns:
+        Tuple of ((species code, common name, scientific name) rows, validators of the
+        response). On failure both are None; if the taxonomy is unchanged the rows are
+        None and the given validators are returned.
+    """
     try:
-        api_key = get_ebird_api_key()
+        session = get_session()
     except ValueError as e:
         print(f"API key configuration error: {str(e)}")
-        return None
+        return None, None
     
-    # eBird API returns CSV by default, but we'll try both formats
     url = f"{EBIRD_API_BASE_URL}/ref/taxonomy/ebird"
     
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    
     try:
-        # Try CSV format first (default for eBird API)
-        headers_csv = {
-            "X-eBirdApiToken": api_key
-        }
-        response = requests.get(url, headers=headers_csv, timeout=30)
+        # Stream the body: only three of the ~15 taxonomy columns are kept
+        response = session.get(url, headers=headers, timeout=30, stream=True)
+        if response.status_code == 304 and validators:
+            response.close()
+            return None, validators
         response.raise_for_status()
+        response_validators = {
+            "etag": response.headers.get("ETag", ""),
+            "last_modified": response.headers.get("Last-Modified", "")
+        }
         
-        # Check if response is empty
-        if not response.text or not response.text.strip():
-            print("eBird API returned empty response")
-            return None
-        
-        # Try to parse as CSV first (most common format)
-        try:
-            import csv
-            from io import StringIO
-            csv_reader = csv.DictReader(StringIO(response.text))
-            taxonomy = list(csv_reader)
-            if taxonomy and len(taxonomy) > 0:
-                _taxonomy_cache = taxonomy
-                return taxonomy
-        except Exception as csv_error:
-            # If CSV parsing fails, try JSON
-            pass
+        with response:
+            # eBird API returns CSV by default, but JSON if asked for it
+            content_type = response.headers.get('Content-Type', 'unknown')
+            if "json" in content_type.lower():
+                taxonomy = _parse_taxonomy_json(response.content)
+            else:
+                if "charset" not in content_type.lower():
+                    # eBird names are UTF-8; don't let requests fall back to Latin-1 for text/csv
+                    response.encoding = "utf-8"
+                taxonomy = _parse_taxonomy_csv(response.iter_lines(decode_unicode=True))
         
-        # Try JSON format
-        try:
-            taxonomy = response.json()
-            if isinstance(taxonomy, list) and len(taxonomy) > 0:
-                _taxonomy_cache = taxonomy
-                return taxonomy
-        except ValueError:
-            pass
+        if taxonomy:
+            return taxonomy, response_validators
         
         # Log response details for debugging
-        content_type = response.headers.get('Content-Type', 'unknown')
         print(f"Could not parse eBird taxonomy response.")
         print(f"Content-Type: {content_type}")
-        print(f"Response length: {len(response.text)}")
-        print(f"Content preview: {response.text[:500]}")
-        return None
+        return None, None
         
     except requests.exceptions.Timeout:
         print("eBird API request timed out")
-        return None
+        return None, None
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 401:
             print("Invalid eBird API key")
@@ -96,13 +186,292 @@ def _load_taxonomy() -> Optional[List[Dict]]:
         else:
             print(f"eBird API error (HTTP {e.response.status_code}): {str(e)}")
             print(f"Response content: {e.response.text[:200]}")
-        return None
+        return None, None
     except requests.exceptions.RequestException as e:
         print(f"Error fetching eBird taxonomy: {str(e)}")
-        return None
+        return None, None
     except Exception as e:
         print(f"Unexpected error loading taxonomy: {str(e)}")
-        return None
+        return None, None
+
+
+# Field names for the same data differ between eBird taxonomy formats (CSV vs JSON)
+_COM_NAME_FIELDS = ["comName", "COMMON_NAME", "common_name", "Common Name", "commonName"]
+_SCI_NAME_FIELDS = ["sciName", "SCIENTIFIC_NAME", "scientific_name", "Scientific Name"]
+_SPECIES_CODE_FIELDS = ["speciesCode", "SPECIES_CODE", "species_code", "Species Code"]
+
+
+def _resolve_field(columns, fields: List[str]) -> Optional[str]:
+    """Get the first field name variant present among a taxonomy's columns."""
+    for field in fields:
+        if field in columns:
+            return field
+    return None
+
+
+def _parse_taxonomy_csv(lines) -> List[Tuple[str, str, str]]:
+    """
+    Parse a taxonomy CSV into (species code, common name, scientific name) rows.
+    
+    Args:
+        lines: Iterable of CSV lines, header first
+    
+    Returns:
+        Taxonomy rows (empty if the header lacks a species code column)
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if not header:
+        return []
+    
+    code_field = _resolve_field(header, _SPECIES_CODE_FIELDS)
+    if code_field is None:
+        return []
+    com_field = _resolve_field(header, _COM_NAME_FIELDS)
+    sci_field = _resolve_field(header, _SCI_NAME_FIELDS)
+    
+    i_code = header.index(code_field)
+    i_com = header.index(com_field) if com_field else None
+    i_sci = header.index(sci_field) if sci_field else None
+    width = max(i for i in (i_code, i_com, i_sci) if i is not None) + 1
+    
+    taxonomy = []
+    for row in reader:
+        if len(row) < width or not row[i_code]:
+            continue
+        taxonomy.append((
+            row[i_code],
+            row[i_com] if i_com is not None else "",
+            row[i_sci] if i_sci is not None else ""
+        ))
+    return taxonomy
+
+
+def _parse_taxonomy_json(content: bytes) -> List[Tuple[str, str, str]]:
+    """
+    Parse a JSON taxonomy into (species code, common name, scientific name) rows.
+    
+    Args:
+        content: Raw JSON response body (a list of species objects)
+    
+    Returns:
+        Taxonomy rows (empty if the body is not a usable species list)
+    """
+    try:
+        species_list = _json_loads(content)
+    except ValueError:
+        return []
+    if not isinstance(species_list, list) or not species_list or not isinstance(species_list[0], dict):
+        return []
+    
+    # Every row of a download has the same format, so resolve the field names once
+    code_field = _resolve_field(species_list[0], _SPECIES_CODE_FIELDS)
+    if code_field is None:
+        return []
+    com_field = _resolve_field(species_list[0], _COM_NAME_FIELDS)
+    sci_field = _resolve_field(species_list[0], _SCI_NAME_FIELDS)
+    
+    return [
+        (str(species[code_field]), str(species.get(com_field) or ""), str(species.get(sci_field) or ""))
+        for species in species_list
+        if species.get(code_field)
+    ]
+
+
+def _word_suffixes(name: str) -> List[str]:
+    """Get the suffixes of a name that start at a word (e.g., "carolina wren", "wren")."""
+    words = name.split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+@dataclass
+class _TaxonomyIndex:
+    """Lookup tables over the eBird taxonomy (one row per species with a code)."""
+    com_names: List[str]  # Lowercased common name per row
+    sci_names: List[str]  # Lowercased scientific name per row
+    codes: List[str]  # Species code per row
+    by_com_lower: Dict[str, int]  # Lowercased common name -> first row with that name
+    by_sci_lower: Dict[str, int]  # Lowercased scientific name -> first row with that name
+    # Prefix index (a flattened trie): sorted word-start suffixes of every name and their rows
+    com_prefixes: List[str]
+    com_prefix_rows: List[int]
+    sci_prefixes: List[str]
+    sci_prefix_rows: List[int]
+
+
+def _build_taxonomy_index(taxonomy: List[Tuple[str, str, str]]) -> _TaxonomyIndex:
+    """Build exact-match and prefix lookup tables from (code, common name, scientific name) rows."""
+    com_names = []
+    sci_names = []
+    codes = []
+    by_com_lower = {}
+    by_sci_lower = {}
+    com_suffixes = []
+    sci_suffixes = []
+    
+    for code, com_name, sci_name in taxonomy:
+        row = len(codes)
+        com_name = com_name.lower()
+        sci_name = sci_name.lower()
+        com_names.append(com_name)
+        sci_names.append(sci_name)
+        codes.append(code)
+        
+        # The first species with a given name wins, as in a front-to-back scan
+        if com_name:
+            by_com_lower.setdefault(com_name, row)
+        if sci_name:
+            by_sci_lower.setdefault(sci_name, row)
+        com_suffixes.extend((suffix, row) for suffix in _word_suffixes(com_name))
+        sci_suffixes.extend((suffix, row) for suffix in _word_suffixes(sci_name))
+    
+    com_suffixes.sort()
+    sci_suffixes.sort()
+    return _TaxonomyIndex(
+        com_names=com_names,
+        sci_names=sci_names,
+        codes=codes,
+        by_com_lower=by_com_lower,
+        by_sci_lower=by_sci_lower,
+        com_prefixes=[suffix for suffix, _ in com_suffixes],
+        com_prefix_rows=[row for _, row in com_suffixes],
+        sci_prefixes=[suffix for suffix, _ in sci_suffixes],
+        sci_prefix_rows=[row for _, row in sci_suffixes]
+    )
+
+
+def _read_taxonomy_file() -> Optional[Dict]:
+    """Read the pickled taxonomy index and its validators, or None if unavailable."""
+    try:
+        with open(TAXONOMY_CACHE_PATH, "rb") as f:
+            stored = pickle.load(f)
+        if (
+            isinstance(stored, dict)
+            and stored.get("version") == TAXONOMY_CACHE_VERSION
+            and isinstance(stored.get("index"), _TaxonomyIndex)
+        ):
+            return stored
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Could not read cached taxonomy: {str(e)}")
+    return None
+
+
+def _write_taxonomy_file(index: _TaxonomyIndex, validators: Dict[str, str]):
+    """Pickle the taxonomy index and its validators (written atomically)."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{TAXONOMY_CACHE_PATH}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"version": TAXONOMY_CACHE_VERSION, "index": index, **validators}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, TAXONOMY_CACHE_PATH)
+    except (OSError, pickle.PicklingError) as e:
+        print(f"Could not save taxonomy cache: {str(e)}")
+
+
+def _fetch_taxonomy_index() -> Optional[_TaxonomyIndex]:
+    """
+    Get the taxonomy index from disk, revalidating it with eBird once it is older than TAXONOMY_MAX_AGE.
+    
+    Returns:
+        Taxonomy index, or None if it is neither cached nor downloadable
+    """
+    stored = _read_taxonomy_file()
+    if stored is not None:
+        try:
+            age = time.time() - os.path.getmtime(TAXONOMY_CACHE_PATH)
+        except OSError:
+            age = TAXONOMY_MAX_AGE + 1
+        if age <= TAXONOMY_MAX_AGE:
+            return stored["index"]
+    
+    validators = None
+    if stored is not None:
+        validators = {"etag": stored.get("etag", ""), "last_modified": stored.get("last_modified", "")}
+    
+    taxonomy, response_validators = _load_taxonomy(validators)
+    if taxonomy is None:
+        if stored is None:
+            return None
+        if response_validators is not None:
+            # Not modified upstream: keep the cached copy for another TAXONOMY_MAX_AGE
+            try:
+                os.utime(TAXONOMY_CACHE_PATH)
+            except OSError:
+                pass
+        # On a failed refresh an outdated taxonomy is still better than none
+        return stored["index"]
+    
+    index = _build_taxonomy_index(taxonomy)
+    _write_taxonomy_file(index, response_validators)
+    return index
+
+
+_taxonomy_index = None
+# Serializes loading so the background preload and a lookup never download the taxonomy twice
+_taxonomy_lock = threading.Lock()
+
+def _get_taxonomy_index() -> Optional[_TaxonomyIndex]:
+    """Get lookup tables for the eBird taxonomy (loaded once per process)."""
+    global _taxonomy_index
+    
+    if _taxonomy_index is None:
+        with _taxonomy_lock:
+            # Another thread may have finished loading while we waited for the lock
+            if _taxonomy_index is None:
+                index = _fetch_taxonomy_index()
+                if index is None:
+                    return None
+                _taxonomy_index = index
+                _lookup_species_code.cache_clear()
+    return _taxonomy_index
+
+
+def _partial_match_rows(
+    name: str,
+    by_name: Dict[str, int],
+    prefixes: List[str],
+    prefix_rows: List[int]
+) -> set:
+    """
+    Find taxonomy rows whose name contains `name` or is contained in it, at word boundaries.
+    
+    Args:
+        name: Lowercased name to match
+        by_name: Exact-match table (name -> row)
+        prefixes: Sorted word-start suffixes of all names
+        prefix_rows: Row of each entry in prefixes
+    
+    Returns:
+        Set of matching row indices
+    """
+    # Names with a word starting with `name`: a prefix range in the sorted suffixes
+    lo = bisect_left(prefixes, name)
+    hi = bisect_left(prefixes, name + "\uffff", lo)
+    rows = set(prefix_rows[lo:hi])
+    
+    # Names made of whole consecutive words of `name`
+    words = name.split()
+    for i in range(len(words)):
+        for j in range(i + 1, len(words) + 1):
+            row = by_name.get(" ".join(words[i:j]))
+            if row is not None:
+                rows.add(row)
+    return rows
+
+
+def preload_taxonomy() -> bool:
+    """
+    Load the eBird taxonomy ahead of the first species lookup.
+    
+    The taxonomy does not depend on the bird suggestions, so callers can load it
+    while waiting on the Mistral API.
+    
+    Returns:
+        True if the taxonomy is available, False otherwise
+    """
+    return _get_taxonomy_index() is not None
 
 
 def get_species_code(bird_name: str, scientific_name: str = "") -> Optional[str]:
@@ -119,84 +488,150 @@ def get_species_code(bird_name: str, scientific_name: str = "") -> Optional[str]
     if not bird_name or not bird_name.strip():
         return None
     
-    taxonomy = _load_taxonomy()
-    if not taxonomy:
+    index = _get_taxonomy_index()
+    if index is None:
+        # Not cached, so lookups succeed once the taxonomy becomes available
         return None
     
-    # Normalize field names (eBird API uses different formats)
-    def get_com_name(species):
-        for field in ["comName", "COMMON_NAME", "common_name", "Common Name", "commonName"]:
-            if field in species and species[field]:
-                return str(species[field])
-        return ""
-    
-    def get_sci_name(species):
-        for field in ["sciName", "SCIENTIFIC_NAME", "scientific_name", "Scientific Name", "sciName"]:
-            if field in species and species[field]:
-                return str(species[field])
-        return ""
-    
-    def get_species_code_field(species):
-        for field in ["speciesCode", "SPECIES_CODE", "species_code", "Species Code", "speciesCode"]:
-            if field in species and species[field]:
-                return str(species[field])
-        return ""
-    
-    bird_name_lower = bird_name.lower().strip()
-    scientific_name_lower = scientific_name.lower().strip() if scientific_name else ""
+    return _lookup_species_code(
+        bird_name.lower().strip(),
+        scientific_name.lower().strip() if scientific_name else ""
+    )
+
+
+@lru_cache(maxsize=4096)
+def _lookup_species_code(bird_name_lower: str, scientific_name_lower: str) -> Optional[str]:
+    """Resolve normalized names against the loaded taxonomy index (memoized)."""
+    index = _taxonomy_index
     
     # Strategy 1: Exact match on common name (case-insensitive)
-    for species in taxonomy:
-        com_name = get_com_name(species).lower()
-        if com_name == bird_name_lower:
-            code = get_species_code_field(species)
-            if code:
-                return code
+    row = index.by_com_lower.get(bird_name_lower)
+    if row is not None:
+        return index.codes[row]
     
     # Strategy 2: If scientific name provided, try exact match on scientific name
     if scientific_name_lower:
-        for species in taxonomy:
-            sci_name = get_sci_name(species).lower()
-            if sci_name == scientific_name_lower:
-                code = get_species_code_field(species)
-                if code:
-                    return code
+        row = index.by_sci_lower.get(scientific_name_lower)
+        if row is not None:
+            return index.codes[row]
     
     # Strategy 3: Partial match - prefer more specific matches (longer names)
     # This helps match "Carolina Wren" instead of just "Wren"
-    matches = []
-    for species in taxonomy:
-        com_name = get_com_name(species).lower()
-        if bird_name_lower in com_name or com_name in bird_name_lower:
-            code = get_species_code_field(species)
-            if code:
-                matches.append((len(com_name), code, com_name))
-    
-    # Sort by length (longer = more specific) and return the most specific match
+    matches = _partial_match_rows(
+        bird_name_lower, index.by_com_lower, index.com_prefixes, index.com_prefix_rows
+    )
     if matches:
-        matches.sort(reverse=True, key=lambda x: x[0])
-        return matches[0][1]
+        best_row = max(matches, key=lambda r: (len(index.com_names[r]), -r))
+        return index.codes[best_row]
     
-    # Strategy 4: Try matching scientific name partially if provided
+    # Strategy 4: Try matching scientific name partially if provided (genus or full name)
     if scientific_name_lower:
-        for species in taxonomy:
-            sci_name = get_sci_name(species).lower()
-            # Match genus or full scientific name
-            if scientific_name_lower in sci_name or sci_name in scientific_name_lower:
-                code = get_species_code_field(species)
-                if code:
-                    return code
+        matches = _partial_match_rows(
+            scientific_name_lower, index.by_sci_lower, index.sci_prefixes, index.sci_prefix_rows
+        )
+        if matches:
+            return index.codes[min(matches)]
     
     return None
 
 
-def get_observations_by_coords(
+def get_species_codes_batch(bird_dicts: List[Dict]) -> Dict[str, str]:
+    """
+    Look up eBird species codes for a list of birds in one call.
+    
+    Not cached itself: individual lookups are memoized once the taxonomy is loaded, and
+    birds looked up while it is unavailable get codes on the next call.
+    
+    Args:
+        bird_dicts: List of dicts with 'common_name' and optional 'scientific_name'
+    
+    Returns:
+        Dictionary mapping common names to eBird species codes (birds without a code are omitted)
+    """
+    species_codes = {}
+    for bird_dict in bird_dicts:
+        common_name = bird_dict.get("common_name", "")
+        if not common_name or common_name in species_codes:
+            continue
+        code = get_species_code(common_name, bird_dict.get("scientific_name", ""))
+        if code:
+            species_codes[common_name] = code
+    return species_codes
+
+
+def _filter_observations_by_date(observations: List[Dict], days_back: int, years_back: int) -> List[Dict]:
+    """
+    Keep observations from the last days_back days, or from the current month in previous years.
+    
+    Args:
+        observations: Observation dictionaries from the eBird API
+        days_back: Number of days back from today to include
+        years_back: Number of previous years to include for the current month
+        
+    Returns:
+        Filtered list of observations
+    """
+    if not observations:
+        return []
+    
+    today = datetime.now().date()
+    cutoff = today - timedelta(days=days_back)
+    allowed_years = [today.year - y for y in range(1, years_back + 1)]
+    
+    # eBird's obsDt is "YYYY-MM-DD" or "YYYY-MM-DD HH:MM"; missing dates become NaT
+    date_strs = [(obs.get("obsDt") or "")[:10] for obs in observations]
+    try:
+        # NumPy would read partial dates such as "2024-05" as the 1st of the period
+        if any(len(date_str) not in (0, 10) for date_str in date_strs):
+            raise ValueError("partial date")
+        dates = np.array(date_strs, dtype="datetime64[D]")
+    except ValueError:
+        # Malformed date somewhere: fall back to the per-observation filter, which skips it
+        return _filter_observations_by_date_loop(observations, today, cutoff, allowed_years)
+    
+    years = dates.astype("datetime64[Y]").astype(np.int64) + 1970
+    months = dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    # NaT compares False everywhere, so observations without a date are dropped
+    mask = (dates >= np.datetime64(cutoff, "D")) | (
+        (months == today.month) & np.isin(years, allowed_years) & ~np.isnat(dates)
+    )
+    return [observations[i] for i in np.flatnonzero(mask)]
+
+
+def _filter_observations_by_date_loop(
+    observations: List[Dict],
+    today: date,
+    cutoff: date,
+    allowed_years: List[int]
+) -> List[Dict]:
+    """
+    Per-observation version of _filter_observations_by_date that skips unparseable dates.
+    """
+    allowed_years = set(allowed_years)
+    
+    filtered_obs = []
+    for obs in observations:
+        try:
+            # eBird's obsDt is "YYYY-MM-DD" or "YYYY-MM-DD HH:MM"
+            obs_date = date.fromisoformat((obs.get("obsDt") or "")[:10])
+        except ValueError:
+            # Skip observations with missing or invalid dates
+            continue
+        
+        # Include if within days_back days, or if same month in previous years
+        if obs_date >= cutoff or (obs_date.month == today.month and obs_date.year in allowed_years):
+            filtered_obs.append(obs)
+    
+    return filtered_obs
+
+
+def _fetch_observations_by_coords(
     species_code: str,
     latitude: float,
     longitude: float,
     days_back: int = 30,
     years_back: int = 5
-) -> List[Dict]:
+) -> Optional[List[Dict]]:
     """
     Get observations for a species near given coordinates.
     
@@ -208,7 +643,7 @@ def get_observations_by_coords(
         years_back: Number of years back for same month observations
     
     Returns:
-        List of observation dictionaries
+        List of observation dictionaries, or None if the request failed
     """
     if not species_code:
         return []
@@ -218,16 +653,12 @@ def get_observations_by_coords(
         return []
     
     try:
-        api_key = get_ebird_api_key()
+        session = get_session()
     except ValueError as e:
         print(f"API key configuration error: {str(e)}")
-        return []
+        return None
     
     url = f"{EBIRD_API_BASE_URL}/data/obs/geo/recent/{species_code}"
-    headers = {
-        "X-eBirdApiToken": api_key
-    }
-    
     params = {
         "lat": latitude,
         "lng": longitude,
@@ -237,42 +668,15 @@ def get_observations_by_coords(
     }
     
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = session.get(url, params=params, timeout=30)
         response.raise_for_status()
-        observations = response.json()
-        
-        # Filter observations by date range
-        today = datetime.now()
-        filtered_obs = []
-        
-        for obs in observations:
-            obs_date_str = obs.get("obsDt", "")
-            if not obs_date_str:
-                continue
-            
-            try:
-                # Parse date (format: YYYY-MM-DD or YYYY-MM-DD HH:MM)
-                obs_date = datetime.strptime(obs_date_str.split()[0], "%Y-%m-%d")
-                
-                # Include if within days_back days
-                days_diff = (today - obs_date).days
-                if days_diff <= days_back:
-                    filtered_obs.append(obs)
-                # Or if same month in previous years
-                elif years_back > 0 and obs_date.month == today.month:
-                    years_diff = today.year - obs_date.year
-                    if 1 <= years_diff <= years_back:
-                        filtered_obs.append(obs)
-            
-            except ValueError:
-                # Skip observations with invalid date format
-                continue
+        observations = _json_loads(response.content)
         
-        return filtered_obs
+        return _filter_observations_by_date(observations, days_back, years_back)
     
     except requests.exceptions.Timeout:
         print(f"eBird API request timed out for {species_code}")
-        return []
+        return None
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 401:
             print("Invalid eBird API key")
@@ -283,21 +687,45 @@ def get_observations_by_coords(
             return []
         else:
             print(f"eBird API error (HTTP {e.response.status_code}) for {species_code}: {str(e)}")
-        return []
+        return None
     except requests.exceptions.RequestException as e:
         print(f"Error fetching observations for {species_code}: {str(e)}")
-        return []
+        return None
     except Exception as e:
         print(f"Unexpected error in get_observations_by_coords: {str(e)}")
-        return []
+        return None
 
 
-def get_observations_by_region(
+def get_observations_by_coords(
     species_code: str,
-    region_code: str,
+    latitude: float,
+    longitude: float,
     days_back: int = 30,
     years_back: int = 5
 ) -> List[Dict]:
+    """
+    Get observations for a species near given coordinates.
+    
+    Args:
+        species_code: eBird species code
+        latitude: Latitude coordinate
+        longitude: Longitude coordinate
+        days_back: Number of days back from today to include
+        years_back: Number of years back for same month observations
+    
+    Returns:
+        List of observation dictionaries
+    """
+    observations = _fetch_observations_by_coords(species_code, latitude, longitude, days_back, years_back)
+    return observations if observations is not None else []
+
+
+def _fetch_observations_by_region(
+    species_code: str,
+    region_code: str,
+    days_back: int = 30,
+    years_back: int = 5
+) -> Optional[List[Dict]]:
     """
     Get observations for a species in a region.
     
@@ -308,60 +736,33 @@ def get_observations_by_region(
         years_back: Number of years back for same month observations
     
     Returns:
-        List of observation dictionaries
+        List of observation dictionaries, or None if the request failed
     """
     if not species_code or not region_code:
         return []
     
     try:
-        api_key = get_ebird_api_key()
+        session = get_session()
     except ValueError as e:
         print(f"API key configuration error: {str(e)}")
-        return []
+        return None
     
     url = f"{EBIRD_API_BASE_URL}/data/obs/{region_code}/recent/{species_code}"
-    headers = {
-        "X-eBirdApiToken": api_key
-    }
-    
     params = {
         "back": days_back,
         "maxResults": 10000
     }
     
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = session.get(url, params=params, timeout=30)
         response.raise_for_status()
-        observations = response.json()
-        
-        # Filter observations by date range (same logic as coords)
-        today = datetime.now()
-        filtered_obs = []
-        
-        for obs in observations:
-            obs_date_str = obs.get("obsDt", "")
-            if not obs_date_str:
-                continue
-            
-            try:
-                obs_date = datetime.strptime(obs_date_str.split()[0], "%Y-%m-%d")
-                
-                days_diff = (today - obs_date).days
-                if days_diff <= days_back:
-                    filtered_obs.append(obs)
-                elif years_back > 0 and obs_date.month == today.month:
-                    years_diff = today.year - obs_date.year
-                    if 1 <= years_diff <= years_back:
-                        filtered_obs.append(obs)
-            
-            except ValueError:
-                continue
+        observations = _json_loads(response.content)
         
-        return filtered_obs
+        return _filter_observations_by_date(observations, days_back, years_back)
     
     except requests.exceptions.Timeout:
         print(f"eBird API request timed out for {species_code} in {region_code}")
-        return []
+        return None
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 401:
             print("Invalid eBird API key")
@@ -372,23 +773,93 @@ def get_observations_by_region(
             return []
         else:
             print(f"eBird API error (HTTP {e.response.status_code}) for {species_code} in {region_code}: {str(e)}")
-        return []
+        return None
     except requests.exceptions.RequestException as e:
         print(f"Error fetching observations for {species_code} in {region_code}: {str(e)}")
-        return []
+        return None
     except Exception as e:
         print(f"Unexpected error in get_observations_by_region: {str(e)}")
-        return []
+        return None
 
 
-def calculate_probabilities(
+def get_observations_by_region(
+    species_code: str,
+    region_code: str,
+    days_back: int = 30,
+    years_back: int = 5
+) -> List[Dict]:
+    """
+    Get observations for a species in a region.
+    
+    Args:
+        species_code: eBird species code
+        region_code: eBird region code (e.g., "US-NY", "US-CA")
+        days_back: Number of days back from today to include
+        years_back: Number of years back for same month observations
+    
+    Returns:
+        List of observation dictionaries
+    """
+    observations = _fetch_observations_by_region(species_code, region_code, days_back, years_back)
+    return observations if observations is not None else []
+
+
+def _count_observations_by_coords(species_code: str, location: Dict, days_back: int, years_back: int) -> Optional[int]:
+    """Count observations near a location (cached), or None if the request failed."""
+    # Snap coordinates to a ~1km grid so nearby queries share cache entries
+    cache_key = (
+        "coords", species_code, round(location["latitude"], 2), round(location["longitude"], 2),
+        days_back, years_back
+    )
+    count = _get_cached_count(cache_key)
+    if count is None:
+        observations = _fetch_observations_by_coords(
+            species_code, location["latitude"], location["longitude"], days_back, years_back
+        )
+        if observations is None:
+            return None
+        count = len(observations)
+        _cache_count(cache_key, count)
+    return count
+
+
+def _count_observations_by_region(species_code: str, location: Dict, days_back: int, years_back: int) -> Optional[int]:
+    """Count observations in a region (cached), or None if the request failed."""
+    cache_key = ("region", species_code, location["region_code"], days_back, years_back)
+    count = _get_cached_count(cache_key)
+    if count is None:
+        observations = _fetch_observations_by_region(species_code, location["region_code"], days_back, years_back)
+        if observations is None:
+            return None
+        count = len(observations)
+        _cache_count(cache_key, count)
+    return count
+
+
+# Observation counter per location type: (species_code, location, days_back, years_back) -> count,
+# or None if the request failed
+_OBS_DISPATCH = {
+    "coords": _count_observations_by_coords,
+    "region": _count_observations_by_region,
+}
+
+
+class _IncompleteProbabilities(Exception):
+    """Raised out of the cached calculation so results missing eBird data are not cached."""
+    
+    def __init__(self, probabilities: Dict[str, float]):
+        super().__init__("eBird data was unavailable for some species")
+        self.probabilities = probabilities
+
+
+def calculate_probabilities_with_status(
     bird_suggestions: List,
     location: Dict,
     days_back: int = 30,
     years_back: int = 5
-) -> Dict[str, float]:
+) -> Tuple[Dict[str, float], bool]:
     """
-    Calculate observation probabilities for bird suggestions based on eBird data.
+    Calculate observation probabilities and report whether all eBird data was available.
     
     Args:
         bird_suggestions: List of bird species names (strings) or dicts with 'common_name' and 'scientific_name'
@@ -397,72 +868,140 @@ def calculate_probabilities(
         years_back: Number of years back for same month
     
     Returns:
-        Dictionary mapping bird names to probability percentages
+        Tuple of (dictionary mapping bird names to probability percentages, completeness).
+        Completeness is False if the taxonomy or any observation request was unavailable,
+        in which case the affected birds count as having no observations.
     
     Raises:
-        ValueError: If location dictionary is invalid
+        ValueError: If location dictionary is invalid or its type is not supported
     """
     if not bird_suggestions:
-        return {}
+        return {}, True
     
     if not location or "type" not in location:
         raise ValueError("Invalid location dictionary. Must have 'type' key.")
     
-    observation_counts = {}
+    if location["type"] not in _OBS_DISPATCH:
+        raise ValueError(f"Unsupported location type: {location['type']!r}")
     
     # Handle both string format (backward compatibility) and dict format
-    bird_list = []
-    for bird in bird_suggestions:
-        if isinstance(bird, dict):
-            bird_list.append(bird)
-        else:
-            bird_list.append({"common_name": str(bird), "scientific_name": ""})
+    bird_list = [
+        bird if isinstance(bird, Mapping) else {"common_name": str(bird), "scientific_name": ""}
+        for bird in bird_suggestions
+    ]
+    
+    # Hashable cache keys; coordinates are snapped to ~1km so nearby points share results
+    names_sci = tuple(
+        ((bird.get("common_name") or "").strip(), (bird.get("scientific_name") or "").strip())
+        for bird in bird_list
+    )
+    loc_key = (
+        location["type"],
+        round(location.get("latitude", 0), 2),
+        round(location.get("longitude", 0), 2),
+        location.get("region_code", "")
+    )
+    try:
+        return _calculate_probabilities_cached(names_sci, loc_key, days_back, years_back, location), True
+    except _IncompleteProbabilities as e:
+        return e.probabilities, False
+
+
+def calculate_probabilities(
+    bird_suggestions: List,
+    location: Dict,
+    days_back: int = 30,
+    years_back: int = 5
+) -> Dict[str, float]:
+    """
+    Calculate observation probabilities for bird suggestions based on eBird data.
     
-    for bird_dict in bird_list:
-        bird_name = bird_dict.get("common_name", "")
-        scientific_name = bird_dict.get("scientific_name", "")
-        
-        if not bird_name or not bird_name.strip():
-            observation_counts[bird_name] = 0
+    Args:
+        bird_suggestions: List of bird species names (strings) or dicts with 'common_name' and 'scientific_name'
+        location: Dictionary with 'type' ('coords' or 'region') and location data
+        days_back: Number of days back to include
+        years_back: Number of years back for same month
+    
+    Returns:
+        Dictionary mapping bird names to probability percentages
+    
+    Raises:
+        ValueError: If location dictionary is invalid or its type is not supported
+    """
+    probabilities, _ = calculate_probabilities_with_status(bird_suggestions, location, days_back, years_back)
+    return probabilities
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _calculate_probabilities_cached(
+    names_sci: Tuple[Tuple[str, str], ...],
+    loc_key: Tuple[str, float, float, str],
+    days_back: int,
+    years_back: int,
+    _location: Dict
+) -> Dict[str, float]:
+    """
+    Calculate observation probabilities (cached for an hour per set of inputs, if complete).
+    
+    Args:
+        names_sci: Stripped (common name, scientific name) pairs
+        loc_key: (location type, latitude, longitude, region code), used only as the cache key
+        days_back: Number of days back to include
+        years_back: Number of years back for same month
+        _location: Full-precision location to query (not hashed by st.cache_data)
+    
+    Returns:
+        Dictionary mapping bird names to probability percentages
+    
+    Raises:
+        _IncompleteProbabilities: With the probabilities, if the taxonomy or any observation
+            request was unavailable (st.cache_data does not cache raised calls)
+    """
+    fetch = _OBS_DISPATCH[loc_key[0]]
+    # Without the taxonomy no species code resolves, which would look like zero observations
+    complete = _get_taxonomy_index() is not None
+    
+    # Resolve species codes first (in-memory lookups); birds without one keep a count of 0
+    names = list(dict.fromkeys(bird_name for bird_name, _ in names_sci))
+    species_codes = {}
+    for bird_name, scientific_name in names_sci:
+        if not bird_name:
             continue
         
         # Get species code (try with scientific name if available)
         species_code = get_species_code(bird_name, scientific_name)
-        if not species_code:
-            observation_counts[bird_name] = 0
-            continue
-        
-        # Get observations based on location type
-        if location["type"] == "coords":
-            observations = get_observations_by_coords(
-                species_code,
-                location["latitude"],
-                location["longitude"],
-                days_back,
-                years_back
-            )
-        elif location["type"] == "region":
-            observations = get_observations_by_region(
-                species_code,
-                location["region_code"],
-                days_back,
-                years_back
-            )
-        else:
-            observation_counts[bird_name] = 0
-            continue
-        
-        observation_counts[bird_name] = len(observations)
+        if species_code:
+            species_codes[bird_name] = species_code
+    
+    # Several suggestions can resolve to the same species (e.g., a subspecies name),
+    # so fetch each species code once
+    unique_codes = set(species_codes.values())
+    
+    # The per-species requests are independent and I/O-bound, so run them concurrently
+    # over the shared session
+    counts_by_code = {}
+    if unique_codes:
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(unique_codes))) as executor:
+            futures = {
+                executor.submit(fetch, species_code, _location, days_back, years_back): species_code
+                for species_code in unique_codes
+            }
+            for future in as_completed(futures):
+                count = future.result()
+                if count is None:
+                    complete = False
+                    count = 0
+                counts_by_code[futures[future]] = count
     
     # Calculate probabilities
-    total_observations = sum(observation_counts.values())
-    
-    probabilities = {}
-    for bird_name, count in observation_counts.items():
-        if total_observations > 0:
-            probabilities[bird_name] = (count / total_observations) * 100
-        else:
-            probabilities[bird_name] = 0.0
-    
+    counts = [counts_by_code.get(species_codes.get(bird_name), 0) for bird_name in names]
+    total_observations = sum(counts)
+    if total_observations == 0:
+        probabilities = dict.fromkeys(names, 0.0)
+    else:
+        scaled = np.asarray(counts, dtype=np.float64) * (100.0 / total_observations)
+        probabilities = dict(zip(names, scaled.tolist()))
+    
+    if not complete:
+        raise _IncompleteProbabilities(probabilities)
     return probabilities
-
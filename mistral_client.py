@@ -5,11 +5,93 @@ Uses Mistral AI API to generate top 5 bird species suggestions from user descrip
 import requests
 import json
 import re
-from typing import List, Dict, Tuple
-from datetime import datetime
+from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import get_mistral_api_key
 
+__all__ = [
+    "get_session",
+    "get_bird_suggestions",
+    "get_description_embedding",
+    "parse_structured_bird_suggestions",
+]
+
+# Prefer orjson for request/response (de)serialization
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
 MISTRAL_API_URL = "https://api.mistral.ai/v1/chat/completions"
+MISTRAL_EMBEDDINGS_URL = "https://api.mistral.ai/v1/embeddings"
+MISTRAL_EMBEDDING_MODEL = "mistral-embed"
+
+
+# Shared HTTP session (pooled connections to api.mistral.ai)
+_session = None
+
+def get_session() -> requests.Session:
+    """
+    Get the shared Mistral HTTP session, creating it on first use.
+    
+    The session reuses connections, retries transient errors, and sends the authorization
+    header on every request. Tests can replace it by assigning mistral_client._session.
+    
+    Raises:
+        ValueError: If the Mistral API key is not configured
+    """
+    global _session
+    
+    if _session is None:
+        retry = Retry(
+            total=3,
+            read=False,  # Never retry read timeouts: each attempt could wait out the full timeout
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["GET", "POST"]),  # Mistral calls are all POSTs
+            raise_on_status=False  # Let raise_for_status() report the final response
+        )
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+        session.headers.update({
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {get_mistral_api_key()}"
+        })
+        _session = session
+    return _session
+
+# Static instructions sent as the system message. Keep request-specific content (description,
+# location, date) out of this string so every request shares the same prompt prefix.
+SYSTEM_PROMPT = """You are an expert ornithologist. Based on the bird description provided, identify the top 5 most likely SPECIFIC bird species.
+
+IMPORTANT: Return SPECIFIC species names, not generic groups. For example:
+- Use "Carolina Wren" NOT just "Wren"
+- Use "American Robin" NOT just "Robin"
+- Use "Northern Cardinal" NOT just "Cardinal"
+- Use "Blue Jay" NOT just "Jay"
+
+Return your response in this EXACT format (one species per line):
+1. Common Name | Scientific Name
+2. Common Name | Scientific Name
+3. Common Name | Scientific Name
+4. Common Name | Scientific Name
+5. Common Name | Scientific Name"""
+
+
+# Chat model that last returned usable suggestions; tried first on the next call
+_last_good_model: Optional[str] = None
+
+
+def _forget_model(model: str):
+    """Stop preferring a model after a model-specific error (e.g., it was retired)."""
+    global _last_good_model
+    if _last_good_model == model:
+        _last_good_model = None
 
 
 def get_bird_suggestions(
@@ -37,7 +119,7 @@ def get_bird_suggestions(
         raise ValueError("Bird description cannot be empty")
     
     try:
-        api_key = get_mistral_api_key()
+        session = get_session()
     except ValueError as e:
         raise Exception(f"API key configuration error: {str(e)}")
     
@@ -49,39 +131,30 @@ def get_bird_suggestions(
         context_parts.append(f"Date: {date_info}")
     context_str = "\n".join(context_parts) if context_parts else ""
     
-    # Create a structured prompt that asks for specific bird species
-    prompt = f"""You are an expert ornithologist. Based on the bird description below, identify the top 5 most likely SPECIFIC bird species.
-
-IMPORTANT: Return SPECIFIC species names, not generic groups. For example:
-- Use "Carolina Wren" NOT just "Wren"
-- Use "American Robin" NOT just "Robin"
-- Use "Northern Cardinal" NOT just "Cardinal"
-- Use "Blue Jay" NOT just "Jay"
-
-Return your response in this EXACT format (one species per line):
-1. Common Name | Scientific Name
-2. Common Name | Scientific Name
-3. Common Name | Scientific Name
-4. Common Name | Scientific Name
-5. Common Name | Scientific Name
-
-Bird Description: {description}
+    # Only the variable inputs go into the user message; the static instructions live in
+    # SYSTEM_PROMPT so the prompt prefix is identical across calls (provider-side prompt caching)
+    prompt = f"""Bird Description: {description}
 {context_str}
 
 Top 5 bird species:"""
 
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}"
-    }
+    global _last_good_model
     
     # Try different models - fallback to mistral-tiny if open-mixtral fails
     models_to_try = ["mistral-large-latest", "mistral-medium-latest", "mistral-small-latest", "mistral-tiny"]
+    # Start with the model that worked last time
+    if _last_good_model in models_to_try:
+        models_to_try.remove(_last_good_model)
+        models_to_try.insert(0, _last_good_model)
     
     for model in models_to_try:
         payload = {
             "model": model,
             "messages": [
+                {
+                    "role": "system",
+                    "content": SYSTEM_PROMPT
+                },
                 {
                     "role": "user",
                     "content": prompt
@@ -92,15 +165,16 @@ Top 5 bird species:"""
         }
         
         try:
-            response = requests.post(MISTRAL_API_URL, headers=headers, json=payload, timeout=30)
+            response = session.post(MISTRAL_API_URL, data=_json_dumps(payload), timeout=30)
             
             # If we get a 404 or 400, try next model
             if response.status_code == 404 or response.status_code == 400:
+                _forget_model(model)
                 continue
             
             response.raise_for_status()
             
-            data = response.json()
+            data = _json_loads(response.content)
             content = data["choices"][0]["message"]["content"].strip()
             
             # Parse the structured response
@@ -111,6 +185,7 @@ Top 5 bird species:"""
                 # Ensure we have exactly 5 suggestions
                 while len(bird_suggestions) < 5:
                     bird_suggestions.append({"common_name": "", "scientific_name": ""})
+                _last_good_model = model
                 # Return suggestions with model info
                 return {
                     "suggestions": bird_suggestions[:5],
@@ -120,6 +195,7 @@ Top 5 bird species:"""
         except requests.exceptions.HTTPError as e:
             # If it's a model-specific error, try next model
             if e.response.status_code in [404, 400]:
+                _forget_model(model)
                 continue
             raise
         except Exception as e:
@@ -129,44 +205,57 @@ Top 5 bird species:"""
             continue
     
     raise Exception("Could not get valid response from any Mistral model")
+
+
+def get_description_embedding(description: str) -> List[float]:
+    """
+    Call Mistral API to embed a bird description.
+    
+    Args:
+        description: User's description of the bird they saw
+    
+    Returns:
+        Embedding vector as a list of floats
+    
+    Raises:
+        ValueError: If description is empty
+        Exception: If API call fails or response cannot be parsed
+    """
+    if not description or not description.strip():
+        raise ValueError("Bird description cannot be empty")
+    
+    try:
+        session = get_session()
+    except ValueError as e:
+        raise Exception(f"API key configuration error: {str(e)}")
+    
+    payload = {
+        "model": MISTRAL_EMBEDDING_MODEL,
+        "input": [description.strip()]
+    }
     
     try:
-        response = requests.post(MISTRAL_API_URL, headers=headers, json=payload, timeout=30)
+        response = session.post(MISTRAL_EMBEDDINGS_URL, data=_json_dumps(payload), timeout=10)
         response.raise_for_status()
-        
-        data = response.json()
-        content = data["choices"][0]["message"]["content"].strip()
-        
-        # Parse the response to extract bird names
-        bird_suggestions = parse_bird_suggestions(content)
-        
-        # Ensure we have exactly 5 suggestions
-        if len(bird_suggestions) < 5:
-            # If we got fewer than 5, pad with empty strings or try to extract more
-            bird_suggestions.extend([""] * (5 - len(bird_suggestions)))
-        elif len(bird_suggestions) > 5:
-            # If we got more than 5, take only the first 5
-            bird_suggestions = bird_suggestions[:5]
-        
-        return bird_suggestions
-    
-    except requests.exceptions.Timeout:
-        raise Exception("Mistral API request timed out. Please try again.")
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 401:
-            raise Exception("Invalid Mistral API key. Please check your API key.")
-        elif e.response.status_code == 429:
-            raise Exception("Mistral API rate limit exceeded. Please wait a moment and try again.")
-        else:
-            raise Exception(f"Mistral API error (HTTP {e.response.status_code}): {str(e)}")
+        data = _json_loads(response.content)
+        return data["data"][0]["embedding"]
     except requests.exceptions.RequestException as e:
-        raise Exception(f"Failed to call Mistral API: {str(e)}")
-    except (KeyError, IndexError) as e:
-        raise Exception(f"Failed to parse Mistral API response: {str(e)}")
-    except ValueError as e:
-        raise e  # Re-raise ValueError from validation
-    except Exception as e:
-        raise Exception(f"Unexpected error calling Mistral API: {str(e)}")
+        raise Exception(f"Failed to call Mistral embeddings API: {str(e)}")
+    except (KeyError, IndexError, ValueError) as e:
+        raise Exception(f"Failed to parse Mistral embeddings response: {str(e)}")
+
+
+# Lines of the response that are not species entries
+_SKIP_KEYWORDS = frozenset(['description:', 'location:', 'date:', 'top 5', 'important:'])
+# Fallback names that are instruction text echoed back by the model
+_INSTRUCTION_KEYWORDS = frozenset(['format', 'example', 'important', 'return'])
+
+_SKIP_LINE_RE = re.compile('|'.join(re.escape(keyword) for keyword in sorted(_SKIP_KEYWORDS)))
+_INSTRUCTION_RE = re.compile('|'.join(sorted(_INSTRUCTION_KEYWORDS)))
+_NUMBERING_RE = re.compile(r'^\d+[\.\)]\s*')
+_NAME_END_RE = re.compile(r'[,:;]')
+_NAME_PUNCT_RE = re.compile(r'[^\w\s-]')
+_SCI_PUNCT_RE = re.compile(r'[^\w\s]')
 
 
 def parse_structured_bird_suggestions(content: str) -> List[Dict[str, str]]:
@@ -188,12 +277,12 @@ def parse_structured_bird_suggestions(content: str) -> List[Dict[str, str]]:
             continue
         
         # Skip lines that are clearly not species entries
-        if any(skip in line.lower() for skip in ['description:', 'location:', 'date:', 'top 5', 'important:']):
+        if _SKIP_LINE_RE.search(line.lower()):
             continue
         
         # Try to parse format: "1. Common Name | Scientific Name"
         # Remove numbering first
-        line_clean = re.sub(r'^\d+[\.\)]\s*', '', line).strip()
+        line_clean = _NUMBERING_RE.sub('', line).strip()
         
         # Split by pipe separator
         if '|' in line_clean:
@@ -203,10 +292,10 @@ def parse_structured_bird_suggestions(content: str) -> List[Dict[str, str]]:
                 scientific_name = parts[1].strip()
                 
                 # Clean up common name (remove extra punctuation)
-                common_name = re.sub(r'[^\w\s-]', '', common_name).strip()
+                common_name = _NAME_PUNCT_RE.sub('', common_name).strip()
                 
                 # Clean up scientific name (should be Genus species format)
-                scientific_name = re.sub(r'[^\w\s]', '', scientific_name).strip()
+                scientific_name = _SCI_PUNCT_RE.sub('', scientific_name).strip()
                 
                 if common_name and len(common_name) > 2:
                     birds.append({
@@ -216,17 +305,12 @@ def parse_structured_bird_suggestions(content: str) -> List[Dict[str, str]]:
                     continue
         
         # Fallback: try to extract just common name if pipe format not found
-        # Remove numbering and common prefixes
-        line_clean = re.sub(r'^\d+[\.\)]\s*', '', line).strip()
-        
         # Try to extract common name (everything before first comma, colon, or dash)
-        common_name = re.split(r'[,:;]', line_clean)[0].strip()
-        common_name = re.sub(r'[^\w\s-]', '', common_name).strip()
+        common_name = _NAME_END_RE.split(line_clean, 1)[0].strip()
+        common_name = _NAME_PUNCT_RE.sub('', common_name).strip()
         
         # Skip if it's too short or looks like instructions
-        if common_name and len(common_name) > 2 and not any(
-            skip in common_name.lower() for skip in ['format', 'example', 'important', 'return']
-        ):
+        if common_name and len(common_name) > 2 and not _INSTRUCTION_RE.search(common_name.lower()):
             birds.append({
                 "common_name": common_name,
                 "scientific_name": ""  # Will try to look up later
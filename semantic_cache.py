@@ -0,0 +1,126 @@
+"""
+Semantic cache for Mistral bird suggestions.
+Reuses previous suggestions when a new description is worded differently but means the same thing.
+"""
+import json
+import os
+import threading
+import numpy as np
+from typing import Dict, List, Optional
+
+# Keep the on-disk store small; the oldest entries are dropped first
+MAX_ENTRIES = 1000
+
+
+class SemanticCache:
+    """
+    Store of (description embedding, context, suggestions) entries persisted as an .npz file.
+
+    Entries are only reused for the same location/date context, since the suggested species
+    depend on where and when the bird was seen.
+    """
+
+    def __init__(self, path: str, threshold: float):
+        """
+        Args:
+            path: Path of the .npz file used to persist the cache
+            threshold: Minimum cosine similarity for a cache hit (0-1)
+        """
+        self.path = path
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._embeddings = None  # (N, D) float32 array of unit-length embeddings
+        self._contexts: List[str] = []
+        self._results: List[str] = []  # JSON-encoded Mistral results
+        self._load()
+
+    def _load(self):
+        """Load persisted entries, starting empty if the file is missing or unreadable."""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with np.load(self.path) as data:
+                self._embeddings = data["embeddings"].astype(np.float32)
+                self._contexts = data["contexts"].tolist()
+                self._results = data["results"].tolist()
+        except Exception as e:
+            print(f"Could not load semantic cache: {str(e)}")
+            self._embeddings = None
+            self._contexts = []
+            self._results = []
+
+    def _save(self):
+        """Persist entries to disk (caller must hold the lock)."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    embeddings=self._embeddings,
+                    contexts=np.array(self._contexts),
+                    results=np.array(self._results)
+                )
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Could not save semantic cache: {str(e)}")
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if vector.ndim != 1 or not norm:
+            return None
+        return vector / norm
+
+    def lookup(self, embedding: List[float], context: str) -> Optional[Dict]:
+        """
+        Find cached suggestions for a similar description in the same context.
+
+        Args:
+            embedding: Embedding of the new description
+            context: Location/date context the suggestions must match
+
+        Returns:
+            Cached Mistral result dictionary, or None on a cache miss
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return None
+
+        with self._lock:
+            if self._embeddings is None or self._embeddings.shape[1] != vector.shape[0]:
+                return None
+
+            sims = self._embeddings @ vector
+            sims[np.asarray(self._contexts) != context] = -1.0
+            best = int(np.argmax(sims))
+            if sims[best] < self.threshold:
+                return None
+            return json.loads(self._results[best])
+
+    def add(self, embedding: List[float], context: str, result: Dict):
+        """
+        Store suggestions for a description and persist the cache.
+
+        Args:
+            embedding: Embedding of the description
+            context: Location/date context of the request
+            result: Mistral result dictionary to cache
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        with self._lock:
+            if self._embeddings is None or self._embeddings.shape[1] != vector.shape[0]:
+                # First entry, or the embedding model changed: start over
+                self._embeddings = vector[np.newaxis, :]
+                self._contexts = [context]
+                self._results = [json.dumps(result)]
+            else:
+                self._embeddings = np.vstack([self._embeddings, vector])[-MAX_ENTRIES:]
+                self._contexts = (self._contexts + [context])[-MAX_ENTRIES:]
+                self._results = (self._results + [json.dumps(result)])[-MAX_ENTRIES:]
+            self._save()